@@ -19,12 +19,34 @@ import os
 import logging
 import argparse
 import urllib3
+import requests
 import json
 import re
+from functools import lru_cache
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from ipaddress import ip_interface
 from pynetbox.core.query import RequestError # type: ignore
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib3.exceptions import InsecureRequestWarning
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as Loader
+except ImportError:
+    from yaml import SafeLoader as Loader
+
+# Encode large API payloads with orjson when installed, else the standard library
+try:
+    import orjson
+
+    def dump_json(obj):
+        return orjson.dumps(obj)
+except ImportError:
+    def dump_json(obj):
+        return json.dumps(obj).encode('utf-8')
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -47,6 +69,15 @@ MANUFACTURER_MAP = {
     'linux': 'Generic'
 }
 
+# Slug and color used when creating each device role
+DEVICE_ROLE_DEFAULTS = {
+    'Spine': {'slug': 'spine', 'color': '2196f3'},
+    'Leaf': {'slug': 'leaf', 'color': '4caf50'},
+    'Border': {'slug': 'border', 'color': 'f44336'},
+    'Network Device': {'slug': 'network-device', 'color': '607d8b'},
+    'Host': {'slug': 'host', 'color': '9e9e9e'}
+}
+
 # Default VLANs for leaf switches
 DEFAULT_VLANS = [
     {"vid": 10, "name": "DATA"},
@@ -54,6 +85,45 @@ DEFAULT_VLANS = [
     {"vid": 30, "name": "GUEST"}
 ]
 
+# VLAN-to-VNI mappings for DEFAULT_VLANS (VLAN 10 -> VNI 10010)
+DEFAULT_VLAN_VNI_MAPPINGS = [
+    {"vlan": vlan["vid"], "vni": 10000 + vlan["vid"]}
+    for vlan in DEFAULT_VLANS
+]
+
+# Config context sections identical for every generated device (shared, never mutated)
+MANAGEMENT_SERVERS = {
+    "ntp_servers": ["10.0.0.100", "10.0.0.101"],
+    "dns_servers": ["10.0.0.50", "10.0.0.51"],
+    "syslog_servers": ["10.0.0.200"]
+}
+
+EVPN_OVERLAY_PEER_GROUP = {
+    "name": "EVPN_OVERLAY",
+    "remote_as": "external",
+    "update_source": "Loopback0",
+    "ebgp_multihop": 3,
+    "send_community": "extended"
+}
+
+SPINE_PEER_GROUPS = [
+    {
+        "name": "SPINE_UNDERLAY",
+        "remote_as": "external",
+        "send_community": "extended"
+    },
+    EVPN_OVERLAY_PEER_GROUP
+]
+
+LEAF_PEER_GROUPS = [
+    {
+        "name": "LEAF_UNDERLAY",
+        "remote_as": "external",
+        "send_community": "extended"
+    },
+    EVPN_OVERLAY_PEER_GROUP
+]
+
 # Base IP ranges for config generation
 LOOPBACK_BASE = "10.255.255."  # Router IDs and VTEP IPs
 SPINE_LOOPBACK_START = 1       # Spine01 = .1, Spine02 = .2
@@ -61,11 +131,68 @@ LEAF_LOOPBACK_START = 11       # Leaf01 = .11, Leaf02 = .12
 BASE_ASN_SPINE = 65000         # Shared ASN for all spines
 BASE_ASN_LEAF = 65001          # Starting ASN for leafs (increments per leaf)
 
+# HTTP connection pooling for NetBox API calls
+HTTP_POOL_CONNECTIONS = 10
+HTTP_POOL_MAXSIZE = 32
+HTTP_RETRY = Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+
+# Concurrent NetBox API calls (kept below HTTP_POOL_MAXSIZE so workers share pooled connections)
+MAX_WORKERS = 16
+
+# Values per multi-value filter query, keeping GET request lines under server limits
+FILTER_CHUNK_SIZE = 100
+
+# Device roles keyed by the first three characters of the hostname
+ROLE_BY_PREFIX = {
+    'spi': 'spine',
+    'lea': 'leaf',
+    'bor': 'border'
+}
+
+# Trailing digits of a device name (e.g., spine01 -> 01)
+_NUM_SUFFIX = re.compile(r'(\d+)$')
+
+def create_http_session(verify_ssl=True):
+    """Create a pooled HTTP session so NetBox API calls reuse connections"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=HTTP_RETRY
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.verify = verify_ssl
+    return session
+
+def netbox_auth_header(token):
+    """Build the Authorization header value for a NetBox API token"""
+    # NetBox 4.5+ v2 tokens (nbt_<id>.<secret>) use the Bearer scheme
+    if token.startswith('nbt_') and '.' in token[4:]:
+        return f"Bearer {token}"
+    return f"Token {token}"
+
+def bulk_patch(nb, endpoint, payload):
+    """Send a list payload as one bulk PATCH, serialized with dump_json instead of pynetbox's encoder"""
+    # The trailing slash matters: Django redirects without it and the PATCH body is dropped
+    response = nb.http_session.patch(
+        endpoint.url.rstrip('/') + '/',
+        data=dump_json(payload),
+        headers={
+            'Accept': 'application/json',
+            'Content-Type': 'application/json',
+            'Authorization': netbox_auth_header(nb.token)
+        }
+    )
+    if not response.ok:
+        raise RequestError(response)
+    return response.json()
+
 def load_clab_yaml(filepath):
     """Load and parse the ContainerLab YAML file"""
     try:
         with open(filepath, 'r') as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=Loader)
             logger.info(f"Successfully loaded ContainerLab file: {filepath}")
             return data
     except FileNotFoundError:
@@ -78,21 +205,20 @@ def load_clab_yaml(filepath):
         logger.error(f"Unexpected error loading file: {e}")
         raise
 
+@lru_cache(maxsize=None)
 def determine_device_role(device_name):
     """Determine device role from hostname"""
     device_lower = device_name.lower()
-    if device_lower.startswith('spine'):
-        return 'spine'
-    elif device_lower.startswith('leaf'):
-        return 'leaf'
-    elif device_lower.startswith('border'):
-        return 'border'
-    else:
-        return 'unknown'
+    role = ROLE_BY_PREFIX.get(device_lower[:3])
+    # Each role name is also its full hostname prefix (e.g., "spider01" is not a spine)
+    if role and device_lower.startswith(role):
+        return role
+    return 'unknown'
 
+@lru_cache(maxsize=None)
 def extract_device_number(device_name):
     """Extract numeric suffix from device name (e.g., spine01 -> 1)"""
-    match = re.search(r'(\d+)$', device_name)
+    match = _NUM_SUFFIX.search(device_name)
     if match:
         return int(match.group(1))
     return 0
@@ -120,36 +246,46 @@ def generate_asn(device_name, role):
     else:
         return BASE_ASN_SPINE
 
-def get_connected_devices(device_name, clab_data):
-    """Get list of devices connected to this device from topology"""
-    connected = []
+def build_adjacency_index(clab_data):
+    """Map each device to the devices it is linked to, scanning the topology links once"""
+    adjacency = defaultdict(list)
     links = clab_data['topology'].get('links', [])
     
     for link in links:
         endpoints = link['endpoints']
-        dev1_name, _ = endpoints[0].split(':')
-        dev2_name, _ = endpoints[1].split(':')
+        dev1_name = endpoints[0].partition(':')[0]
+        dev2_name = endpoints[1].partition(':')[0]
         
-        if dev1_name == device_name:
-            connected.append(dev2_name)
-        elif dev2_name == device_name:
-            connected.append(dev1_name)
+        adjacency[dev1_name].append(dev2_name)
+        adjacency[dev2_name].append(dev1_name)
     
-    return connected
+    return adjacency
+
+def build_device_tables(device_names):
+    """Precompute role, router ID and ASN for each device so generators can look them up"""
+    role_of = {name: determine_device_role(name) for name in device_names}
+    router_id_of = {name: generate_router_id(name, role_of[name]) for name in device_names}
+    asn_of = {name: generate_asn(name, role_of[name]) for name in device_names}
+    return role_of, router_id_of, asn_of
 
-def generate_spine_config_context(device_name, device_data, clab_data, all_devices):
+def get_connected_devices(device_name, adjacency):
+    """Get list of devices connected to this device from the adjacency index"""
+    return adjacency.get(device_name, [])
+
+def generate_spine_config_context(device_name, device_data, adjacency, all_devices,
+                                  role_of, router_id_of, asn_of):
     """Generate config context for spine switches"""
-    router_id = generate_router_id(device_name, 'spine')
-    asn = generate_asn(device_name, 'spine')
+    router_id = router_id_of[device_name]
+    asn = asn_of[device_name]
     
     # Get connected leaf switches
-    connected_devices = get_connected_devices(device_name, clab_data)
-    leaf_neighbors = [dev for dev in connected_devices if determine_device_role(dev) == 'leaf']
+    connected_devices = get_connected_devices(device_name, adjacency)
+    leaf_neighbors = [dev for dev in connected_devices if role_of[dev] == 'leaf']
     
     # Build EVPN neighbor list
     evpn_neighbors = []
     for leaf in leaf_neighbors:
-        leaf_router_id = generate_router_id(leaf, 'leaf')
+        leaf_router_id = router_id_of[leaf]
         evpn_neighbors.append({
             "ip": leaf_router_id,
             "encapsulation": "vxlan"
@@ -165,58 +301,36 @@ def generate_spine_config_context(device_name, device_data, clab_data, all_devic
             },
             "maximum_paths": 4,
             "ecmp_paths": 4,
-            "peer_groups": [
-                {
-                    "name": "SPINE_UNDERLAY",
-                    "remote_as": "external",
-                    "send_community": "extended"
-                },
-                {
-                    "name": "EVPN_OVERLAY",
-                    "remote_as": "external",
-                    "update_source": "Loopback0",
-                    "ebgp_multihop": 3,
-                    "send_community": "extended"
-                }
-            ],
+            "peer_groups": SPINE_PEER_GROUPS,
             "evpn": {
                 "route_reflector_client": False,
                 "neighbors": evpn_neighbors
             }
         },
-        "ntp_servers": ["10.0.0.100", "10.0.0.101"],
-        "dns_servers": ["10.0.0.50", "10.0.0.51"],
-        "syslog_servers": ["10.0.0.200"]
+        **MANAGEMENT_SERVERS
     }
     
     return config_context
 
-def generate_leaf_config_context(device_name, device_data, clab_data, all_devices):
+def generate_leaf_config_context(device_name, device_data, adjacency, all_devices,
+                                 role_of, router_id_of, asn_of):
     """Generate config context for leaf switches"""
-    router_id = generate_router_id(device_name, 'leaf')
-    asn = generate_asn(device_name, 'leaf')
+    router_id = router_id_of[device_name]
+    asn = asn_of[device_name]
     
     # Get connected spine switches
-    connected_devices = get_connected_devices(device_name, clab_data)
-    spine_neighbors = [dev for dev in connected_devices if determine_device_role(dev) == 'spine']
+    connected_devices = get_connected_devices(device_name, adjacency)
+    spine_neighbors = [dev for dev in connected_devices if role_of[dev] == 'spine']
     
     # Build EVPN neighbor list
     evpn_neighbors = []
     for spine in spine_neighbors:
-        spine_router_id = generate_router_id(spine, 'spine')
+        spine_router_id = router_id_of[spine]
         evpn_neighbors.append({
             "ip": spine_router_id,
             "encapsulation": "vxlan"
         })
     
-    # Generate VLAN-to-VNI mappings
-    vlan_vni_mappings = []
-    for vlan in DEFAULT_VLANS:
-        vlan_vni_mappings.append({
-            "vlan": vlan["vid"],
-            "vni": 10000 + vlan["vid"]  # VLAN 10 -> VNI 10010
-        })
-    
     config_context = {
         "vlans": DEFAULT_VLANS,
         "vxlan": {
@@ -226,7 +340,7 @@ def generate_leaf_config_context(device_name, device_data, clab_data, all_device
             },
             "vtep_source_interface": "Loopback1",
             "udp_port": 4789,
-            "vlan_vni_mappings": vlan_vni_mappings
+            "vlan_vni_mappings": DEFAULT_VLAN_VNI_MAPPINGS
         },
         "bgp": {
             "asn": asn,
@@ -237,28 +351,13 @@ def generate_leaf_config_context(device_name, device_data, clab_data, all_device
             },
             "maximum_paths": 4,
             "ecmp_paths": 4,
-            "peer_groups": [
-                {
-                    "name": "LEAF_UNDERLAY",
-                    "remote_as": "external",
-                    "send_community": "extended"
-                },
-                {
-                    "name": "EVPN_OVERLAY",
-                    "remote_as": "external",
-                    "update_source": "Loopback0",
-                    "ebgp_multihop": 3,
-                    "send_community": "extended"
-                }
-            ],
+            "peer_groups": LEAF_PEER_GROUPS,
             "evpn": {
                 "route_reflector_client": False,
                 "neighbors": evpn_neighbors
             }
         },
-        "ntp_servers": ["10.0.0.100", "10.0.0.101"],
-        "dns_servers": ["10.0.0.50", "10.0.0.51"],
-        "syslog_servers": ["10.0.0.200"]
+        **MANAGEMENT_SERVERS
     }
     
     return config_context
@@ -276,13 +375,90 @@ def apply_config_context(nb, device, config_context, device_name):
     except Exception as e:
         logger.error(f"Unexpected error applying config context to {device_name}: {e}")
 
-def get_or_create_manufacturer(nb, name):
+def apply_config_contexts(nb, pending):
+    """Apply config contexts to many devices with a single bulk PATCH
+
+    pending is a list of (device, config_context, device_name) tuples. Devices whose
+    local_context_data already matches are skipped. If the bulk update is rejected,
+    each device is saved individually so errors are reported per device.
+    """
+    changed = []
+    for device, config_context, device_name in pending:
+        if (getattr(device, 'local_context_data', None) or {}) == config_context:
+            logger.debug(f"Config context unchanged for {device_name}, skipping")
+        else:
+            changed.append((device, config_context, device_name))
+    
+    if len(changed) < len(pending):
+        logger.info(f"Config context unchanged for {len(pending) - len(changed)} devices")
+    pending = changed
+    if not pending:
+        return
+    
+    logger.info(f"Applying config context to {len(pending)} devices")
+    try:
+        # NetBox stores config context as local_context_data on the device
+        bulk_patch(nb, nb.dcim.devices, [
+            {'id': device.id, 'local_context_data': config_context}
+            for device, config_context, _ in pending
+        ])
+        logger.info(f"Successfully applied config context to {len(pending)} devices")
+        return
+    except Exception as e:
+        logger.warning(f"Bulk config context update failed, retrying per device: {e}")
+    
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for device, config_context, device_name in pending:
+            executor.submit(apply_config_context, nb, device, config_context, device_name)
+
+def prefetch_netbox_objects(nb):
+    """Fetch existing NetBox objects once and index them for local lookups"""
+    logger.info("Prefetching existing NetBox objects...")
+    
+    def index_by(endpoint, attr):
+        return {getattr(obj, attr): obj for obj in endpoint.all()}
+    
+    # The object types are independent, so list them concurrently
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {
+            'manufacturers': executor.submit(index_by, nb.dcim.manufacturers, 'name'),
+            'device_types': executor.submit(index_by, nb.dcim.device_types, 'model'),
+            'sites': executor.submit(index_by, nb.dcim.sites, 'name'),
+            'device_roles': executor.submit(index_by, nb.dcim.device_roles, 'name'),
+            'platforms': executor.submit(index_by, nb.dcim.platforms, 'name')
+        }
+        cache = {object_type: future.result() for object_type, future in futures.items()}
+    cache['interfaces'] = {}
+    
+    for object_type, objects in cache.items():
+        logger.debug(f"Prefetched {len(objects)} {object_type}")
+    return cache
+
+def filter_in_chunks(endpoint, field, values):
+    """Filter an endpoint on a multi-value field, querying FILTER_CHUNK_SIZE values at a time"""
+    values = list(values)
+    for start in range(0, len(values), FILTER_CHUNK_SIZE):
+        yield from endpoint.filter(**{field: values[start:start + FILTER_CHUNK_SIZE]})
+
+def prefetch_interfaces(nb, devices, interfaces):
+    """Fetch interfaces of the given devices once, keyed by (device id, interface name)"""
+    device_ids = [device.id for device in devices.values()]
+    if not device_ids:
+        return
+    
+    # NetBox accepts repeated device_id parameters, so each chunk is one paginated list
+    for interface in filter_in_chunks(nb.dcim.interfaces, 'device_id', device_ids):
+        interfaces[(interface.device.id, interface.name)] = interface
+    logger.debug(f"Prefetched {len(interfaces)} interfaces for {len(device_ids)} devices")
+
+def get_or_create_manufacturer(nb, name, manufacturers):
     """Get or create a manufacturer in NetBox"""
     try:
-        manufacturer = nb.dcim.manufacturers.get(name=name)
+        manufacturer = manufacturers.get(name)
         if not manufacturer:
             logger.info(f"Creating manufacturer: {name}")
             manufacturer = nb.dcim.manufacturers.create(name=name, slug=name.lower())
+            manufacturers[name] = manufacturer
         else:
             logger.debug(f"Manufacturer already exists: {name}")
         return manufacturer
@@ -293,11 +469,11 @@ def get_or_create_manufacturer(nb, name):
         logger.error(f"Unexpected error with manufacturer {name}: {e}")
         raise
 
-def get_or_create_device_type(nb, kind, manufacturer_id):
+def get_or_create_device_type(nb, kind, manufacturer_id, device_types):
     """Get or create a device type in NetBox"""
     try:
         device_type_name = DEVICE_TYPE_MAP.get(kind, kind)
-        device_type = nb.dcim.device_types.get(model=device_type_name)
+        device_type = device_types.get(device_type_name)
         
         if not device_type:
             logger.info(f"Creating device type: {device_type_name}")
@@ -306,6 +482,7 @@ def get_or_create_device_type(nb, kind, manufacturer_id):
                 model=device_type_name,
                 slug=device_type_name.lower().replace(' ', '-')
             )
+            device_types[device_type_name] = device_type
         else:
             logger.debug(f"Device type already exists: {device_type_name}")
         return device_type
@@ -316,16 +493,17 @@ def get_or_create_device_type(nb, kind, manufacturer_id):
         logger.error(f"Unexpected error with device type {device_type_name}: {e}")
         raise
 
-def get_or_create_site(nb, name):
+def get_or_create_site(nb, name, sites):
     """Get or create a site in NetBox using the clab name"""
     try:
-        site = nb.dcim.sites.get(name=name)
+        site = sites.get(name)
         if not site:
             logger.info(f"Creating site: {name}")
             site = nb.dcim.sites.create(
                 name=name,
                 slug=name.lower().replace(' ', '-')
             )
+            sites[name] = site
         else:
             logger.debug(f"Site already exists: {name}")
         return site
@@ -336,17 +514,18 @@ def get_or_create_site(nb, name):
         logger.error(f"Unexpected error with site {name}: {e}")
         raise
 
-def get_or_create_device_role(nb, role_name):
+def get_or_create_device_role(nb, role_name, device_roles):
     """Get or create a device role"""
     try:
-        role = nb.dcim.device_roles.get(name=role_name)
+        role = device_roles.get(role_name)
         if not role:
             logger.info(f"Creating device role: {role_name}")
-            role = nb.dcim.device_roles.create(
-                name=role_name,
-                slug=role_name.lower().replace(' ', '-'),
-                color='2196f3'  # Blue color
-            )
+            role_defaults = DEVICE_ROLE_DEFAULTS.get(role_name) or {
+                'slug': role_name.lower().replace(' ', '-'),
+                'color': '2196f3'
+            }
+            role = nb.dcim.device_roles.create(name=role_name, **role_defaults)
+            device_roles[role_name] = role
         else:
             logger.debug(f"Device role already exists: {role_name}")
         return role
@@ -357,9 +536,35 @@ def get_or_create_device_role(nb, role_name):
         logger.error(f"Unexpected error with device role {role_name}: {e}")
         raise
 
-def create_devices(nb, clab_data, site_id):
+def bulk_create(endpoint, payloads, object_label):
+    """Create objects with one bulk POST, retrying singly on failure to pinpoint bad entries
+
+    Returns a list aligned with payloads, holding None for entries that could not be created.
+    """
+    if not payloads:
+        return []
+    
+    try:
+        return endpoint.create(payloads)
+    except Exception as e:
+        logger.warning(f"Bulk create of {len(payloads)} {object_label} failed, retrying individually: {e}")
+    
+    def create_one(payload):
+        try:
+            return endpoint.create(payload)
+        except RequestError as e:
+            logger.error(f"NetBox API error creating {object_label} {payload}: {e}")
+        except Exception as e:
+            logger.error(f"Unexpected error creating {object_label} {payload}: {e}")
+        return None
+    
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        return list(executor.map(create_one, payloads))
+
+def create_devices(nb, clab_data, site_id, cache):
     """Create devices from ContainerLab topology"""
     devices = {}
+    mgmt_ips = {}
     nodes = clab_data['topology']['nodes']
     
     # Extract management subnet prefix length from clab.yml
@@ -379,66 +584,101 @@ def create_devices(nb, clab_data, site_id):
     
     logger.info(f"Processing {len(nodes)} devices")
     
+    # Look up existing devices with a few chunked queries (none when the topology is empty)
+    existing_devices = {device.name: device for device in filter_in_chunks(nb.dcim.devices, 'name', nodes)}
+    new_device_params = []
+    
+    # Manufacturer, device type and platform depend only on the node kind, so resolve them once per kind
+    kind_objects = {}
+    for kind in dict.fromkeys(node_data.get('kind', 'linux') for node_data in nodes.values()):
+        try:
+            # Get or create manufacturer
+            manufacturer_name = MANUFACTURER_MAP.get(kind, 'Generic')
+            manufacturer = get_or_create_manufacturer(nb, manufacturer_name, cache['manufacturers'])
+            
+            # Get or create device type
+            device_type = get_or_create_device_type(nb, kind, manufacturer.id, cache['device_types'])
+            
+            # Set platform for Arista devices
+            platform = None
+            if kind == 'ceos':
+                platform = get_or_create_platform(nb, 'Arista EOS', manufacturer.id, cache['platforms'])
+            
+            kind_objects[kind] = (device_type, platform)
+        except Exception as e:
+            logger.error(f"Error preparing NetBox objects for kind '{kind}': {e}")
+    
     for node_name, node_data in nodes.items():
         try:
             kind = node_data.get('kind', 'linux')
             mgmt_ip = node_data.get('mgmt-ipv4')
             
+            if kind not in kind_objects:
+                logger.error(f"Skipping device {node_name}: NetBox objects for kind '{kind}' are unavailable")
+                continue
+            device_type, platform = kind_objects[kind]
+            
             # Determine device role from hostname
             device_role_name = determine_device_role(node_name)
             
-            # Get or create manufacturer
-            manufacturer_name = MANUFACTURER_MAP.get(kind, 'Generic')
-            manufacturer = get_or_create_manufacturer(nb, manufacturer_name)
-            
-            # Get or create device type
-            device_type = get_or_create_device_type(nb, kind, manufacturer.id)
-            
             # Get or create device role based on hostname pattern
             if device_role_name in ['spine', 'leaf', 'border']:
-                role = get_or_create_device_role(nb, device_role_name.capitalize())
+                role = get_or_create_device_role(nb, device_role_name.capitalize(), cache['device_roles'])
             else:
-                role = get_or_create_device_role(nb, 'Network Device' if kind == 'ceos' else 'Host')
+                role = get_or_create_device_role(nb, 'Network Device' if kind == 'ceos' else 'Host',
+                                                 cache['device_roles'])
             
-            # Set platform for Arista devices
-            platform = None
-            if kind == 'ceos':
-                platform = get_or_create_platform(nb, 'Arista EOS', manufacturer.id)
+            if mgmt_ip:
+                mgmt_ips[node_name] = mgmt_ip
             
             # Check if device exists
-            device = nb.dcim.devices.get(name=node_name)
-            if not device:
-                logger.info(f"Creating device: {node_name} (role: {device_role_name})")
-                device_params = {
-                    'name': node_name,
-                    'device_type': device_type.id,
-                    'role': role.id,
-                    'site': site_id
-                }
-                if platform:
-                    device_params['platform'] = platform.id
-                    
-                device = nb.dcim.devices.create(**device_params)
-            else:
+            device = existing_devices.get(node_name)
+            if device:
                 logger.info(f"Device already exists: {node_name}")
+                devices[node_name] = device
+                continue
             
-            devices[node_name] = device
+            logger.info(f"Creating device: {node_name} (role: {device_role_name})")
+            device_params = {
+                'name': node_name,
+                'device_type': device_type.id,
+                'role': role.id,
+                'site': site_id
+            }
+            if platform:
+                device_params['platform'] = platform.id
             
-            # Create management IP if specified
-            if mgmt_ip:
-                create_management_ip(nb, device, mgmt_ip, mgmt_prefix_len)
+            new_device_params.append(device_params)
                 
         except Exception as e:
             logger.error(f"Error processing device {node_name}: {e}")
             continue
     
+    # Create all new devices in a single bulk call
+    created = bulk_create(nb.dcim.devices, new_device_params, 'devices')
+    for device_params, device in zip(new_device_params, created):
+        if device:
+            devices[device_params['name']] = device
+    
+    # Keep devices in topology order
+    devices = {name: devices[name] for name in nodes if name in devices}
+    
+    # Load existing interfaces before creating management IPs. New devices are included
+    # because NetBox creates interfaces from the device type's interface templates
+    prefetch_interfaces(nb, devices, cache['interfaces'])
+    
+    # Load existing IPs in the management subnet with one query instead of one lookup per device
+    existing_ips = {ip.address: ip for ip in nb.ipam.ip_addresses.filter(parent=mgmt_subnet)}
+    
+    create_management_ips(nb, devices, mgmt_ips, mgmt_prefix_len, cache['interfaces'], existing_ips)
+    
     logger.info(f"Successfully processed {len(devices)} devices")
     return devices
 
-def get_or_create_platform(nb, platform_name, manufacturer_id):
+def get_or_create_platform(nb, platform_name, manufacturer_id, platforms):
     """Get or create a platform in NetBox"""
     try:
-        platform = nb.dcim.platforms.get(name=platform_name)
+        platform = platforms.get(platform_name)
         if not platform:
             logger.info(f"Creating platform: {platform_name}")
             platform = nb.dcim.platforms.create(
@@ -446,6 +686,7 @@ def get_or_create_platform(nb, platform_name, manufacturer_id):
                 slug=platform_name.lower().replace(' ', '-'),
                 manufacturer=manufacturer_id
             )
+            platforms[platform_name] = platform
         else:
             logger.debug(f"Platform already exists: {platform_name}")
         return platform
@@ -456,9 +697,15 @@ def get_or_create_platform(nb, platform_name, manufacturer_id):
         logger.error(f"Unexpected error with platform {platform_name}: {e}")
         raise
 
-def create_management_ip(nb, device, mgmt_ip, prefix_len):
-    """Create management IP address for a device"""
-    try:
+def create_management_ips(nb, devices, mgmt_ips, prefix_len, interfaces, existing_ips):
+    """Create management IP addresses for devices using bulk API calls"""
+    pending_ips = {}
+    
+    for node_name, mgmt_ip in mgmt_ips.items():
+        device = devices.get(node_name)
+        if not device:
+            continue
+        
         # Add prefix length from the management subnet if not already included
         if '/' not in mgmt_ip:
             ip_addr = f"{mgmt_ip}/{prefix_len}"
@@ -467,55 +714,81 @@ def create_management_ip(nb, device, mgmt_ip, prefix_len):
         
         # Validate the IP address format
         try:
-            from ipaddress import ip_interface as validate_ip
-            validate_ip(ip_addr)
+            ip_interface(ip_addr)
         except ValueError as e:
             logger.error(f"Invalid IP address format {ip_addr}: {e}")
-            return
-        
-        existing_ip = nb.ipam.ip_addresses.get(address=ip_addr)
+            continue
         
-        if not existing_ip:
-            logger.info(f"Creating management IP: {ip_addr} for {device.name}")
-            # NetBox requires assignment to an interface, not directly to device
-            # Create or get a management interface first
-            mgmt_interface = get_or_create_interface(nb, device, 'Management1')
-            
-            if not mgmt_interface:
-                logger.error(f"Could not create management interface for {device.name}")
-                return
-            
-            ip_obj = nb.ipam.ip_addresses.create(
-                address=ip_addr,
-                assigned_object_type='dcim.interface',
-                assigned_object_id=mgmt_interface.id,
-                description=f"Management IP for {device.name}"
-            )
-            
-            # Set as primary IP for the device
-            device.primary_ip4 = ip_obj.id
-            device.save()
+        if ip_addr not in existing_ips:
+            pending_ips[node_name] = ip_addr
         else:
             logger.debug(f"IP already exists: {ip_addr}")
-    except RequestError as e:
-        logger.error(f"NetBox API error creating IP {ip_addr} for {device.name}: {e}")
-    except Exception as e:
-        logger.error(f"Unexpected error creating IP for {device.name}: {e}")
+    
+    if not pending_ips:
+        return
+    
+    # NetBox requires assignment to an interface, not directly to device
+    # Create any missing management interfaces first
+    get_or_create_interfaces(nb, [(devices[node_name], 'Management1') for node_name in pending_ips], interfaces)
+    
+    ip_devices = []
+    ip_params = []
+    for node_name, ip_addr in pending_ips.items():
+        device = devices[node_name]
+        mgmt_interface = interfaces.get((device.id, 'Management1'))
+        
+        if not mgmt_interface:
+            logger.error(f"Could not create management interface for {device.name}")
+            continue
+        
+        logger.info(f"Creating management IP: {ip_addr} for {device.name}")
+        ip_devices.append(device)
+        ip_params.append({
+            'address': ip_addr,
+            'assigned_object_type': 'dcim.interface',
+            'assigned_object_id': mgmt_interface.id,
+            'description': f"Management IP for {device.name}"
+        })
+    
+    created = bulk_create(nb.ipam.ip_addresses, ip_params, 'IP addresses')
+    for ip_obj in created:
+        if ip_obj:
+            existing_ips[ip_obj.address] = ip_obj
+    
+    # Set as primary IP for each device in a single bulk update
+    primary_ip_updates = [
+        {'id': device.id, 'primary_ip4': ip_obj.id}
+        for device, ip_obj in zip(ip_devices, created) if ip_obj
+    ]
+    if primary_ip_updates:
+        try:
+            nb.dcim.devices.update(primary_ip_updates)
+        except RequestError as e:
+            logger.error(f"NetBox API error setting primary IPs: {e}")
+
+def parse_endpoint(endpoint):
+    """Split a "device:interface" link endpoint into device and interface names"""
+    device_name, sep, intf_name = endpoint.partition(':')
+    if not sep:
+        raise ValueError(f"Endpoint '{endpoint}' is not in device:interface format")
+    return device_name, intf_name
 
-def create_interfaces_and_links(nb, clab_data, devices):
+def create_interfaces_and_links(nb, clab_data, devices, interfaces):
     """Create interfaces and links from ContainerLab topology"""
     links = clab_data['topology'].get('links', [])
     
     logger.info(f"Processing {len(links)} links")
-    successful_links = 0
     
+    # Phase 1: collect the interfaces each link needs
+    link_endpoints = []
+    interface_specs = []
     for link in links:
         try:
             endpoints = link['endpoints']
             
             # Parse endpoints (format: "device:interface")
-            device1_name, intf1_name = endpoints[0].split(':')
-            device2_name, intf2_name = endpoints[1].split(':')
+            device1_name, intf1_name = parse_endpoint(endpoints[0])
+            device2_name, intf2_name = parse_endpoint(endpoints[1])
             
             # Get devices
             device1 = devices.get(device1_name)
@@ -525,14 +798,8 @@ def create_interfaces_and_links(nb, clab_data, devices):
                 logger.warning(f"Could not find devices for link {endpoints}")
                 continue
             
-            # Create interfaces
-            intf1 = get_or_create_interface(nb, device1, intf1_name)
-            intf2 = get_or_create_interface(nb, device2, intf2_name)
-            
-            # Create cable connection
-            if intf1 and intf2:
-                create_cable(nb, intf1, intf2)
-                successful_links += 1
+            link_endpoints.append(((device1, intf1_name), (device2, intf2_name)))
+            interface_specs.extend([(device1, intf1_name), (device2, intf2_name)])
                 
         except ValueError as e:
             logger.error(f"Error parsing link endpoints {link}: {e}")
@@ -541,62 +808,82 @@ def create_interfaces_and_links(nb, clab_data, devices):
             logger.error(f"Error processing link {link}: {e}")
             continue
     
-    logger.info(f"Successfully processed {successful_links}/{len(links)} links")
+    # Phase 2: create missing interfaces in bulk
+    get_or_create_interfaces(nb, interface_specs, interfaces)
+    
+    # Phase 3: resolve interface IDs and create cables in bulk
+    interface_pairs = []
+    for (device1, intf1_name), (device2, intf2_name) in link_endpoints:
+        intf1 = interfaces.get((device1.id, intf1_name))
+        intf2 = interfaces.get((device2.id, intf2_name))
+        
+        if intf1 and intf2:
+            interface_pairs.append((intf1, intf2))
+    
+    create_cables(nb, interface_pairs)
+    
+    logger.info(f"Successfully processed {len(interface_pairs)}/{len(links)} links")
 
-def get_or_create_interface(nb, device, intf_name):
-    """Get or create an interface on a device"""
-    try:
-        interface = nb.dcim.interfaces.get(device_id=device.id, name=intf_name)
+def get_or_create_interfaces(nb, interface_specs, interfaces):
+    """Get or create interfaces from (device, interface name) pairs using one bulk call"""
+    new_interface_params = []
+    staged = set()
+    
+    for device, intf_name in interface_specs:
+        key = (device.id, intf_name)
+        if key in interfaces:
+            logger.debug(f"Interface already exists: {device.name}:{intf_name}")
+            continue
+        if key in staged:
+            continue
         
-        if not interface:
-            logger.info(f"Creating interface: {device.name}:{intf_name}")
-            
-            # Determine interface type based on name
-            if intf_name.lower().startswith('mgmt') or intf_name.lower().startswith('management'):
-                intf_type = '1000base-t'
-            else:
-                intf_type = '1000base-x-sfp'
-            
-            interface = nb.dcim.interfaces.create(
-                device=device.id,
-                name=intf_name,
-                type=intf_type
-            )
+        logger.info(f"Creating interface: {device.name}:{intf_name}")
+        
+        # Determine interface type based on name
+        if intf_name.lower().startswith('mgmt') or intf_name.lower().startswith('management'):
+            intf_type = '1000base-t'
         else:
-            logger.debug(f"Interface already exists: {device.name}:{intf_name}")
+            intf_type = '1000base-x-sfp'
         
-        return interface
-    except RequestError as e:
-        logger.error(f"NetBox API error creating interface {device.name}:{intf_name}: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"Unexpected error creating interface {device.name}:{intf_name}: {e}")
-        return None
+        staged.add(key)
+        new_interface_params.append({
+            'device': device.id,
+            'name': intf_name,
+            'type': intf_type
+        })
+    
+    created = bulk_create(nb.dcim.interfaces, new_interface_params, 'interfaces')
+    for interface_params, interface in zip(new_interface_params, created):
+        if interface:
+            interfaces[(interface_params['device'], interface_params['name'])] = interface
 
-def create_cable(nb, intf1, intf2):
-    """Create a cable connection between two interfaces"""
-    try:
+def create_cables(nb, interface_pairs):
+    """Create cable connections between interface pairs using one bulk call
+
+    Interfaces come from the prefetched cache, so their cable field is already loaded.
+    """
+    cable_params = []
+    
+    for intf1, intf2 in interface_pairs:
         # Check if cable already exists
         if intf1.cable or intf2.cable:
             logger.debug(f"Cable already exists between {intf1.device.name}:{intf1.name} and {intf2.device.name}:{intf2.name}")
-            return
+            continue
         
         logger.info(f"Creating cable: {intf1.device.name}:{intf1.name} <-> {intf2.device.name}:{intf2.name}")
         
-        cable = nb.dcim.cables.create(
-            a_terminations=[{
+        cable_params.append({
+            'a_terminations': [{
                 'object_type': 'dcim.interface',
                 'object_id': intf1.id
             }],
-            b_terminations=[{
+            'b_terminations': [{
                 'object_type': 'dcim.interface',
                 'object_id': intf2.id
             }]
-        )
-    except RequestError as e:
-        logger.error(f"NetBox API error creating cable between {intf1.device.name}:{intf1.name} and {intf2.device.name}:{intf2.name}: {e}")
-    except Exception as e:
-        logger.error(f"Unexpected error creating cable: {e}")
+        })
+    
+    bulk_create(nb.dcim.cables, cable_params, 'cables')
 
 def generate_and_apply_config_contexts(nb, clab_data, devices):
     """Generate and apply config contexts to all devices"""
@@ -605,11 +892,14 @@ def generate_and_apply_config_contexts(nb, clab_data, devices):
     logger.info("=" * 50)
     
     nodes = clab_data['topology']['nodes']
+    adjacency = build_adjacency_index(clab_data)
+    role_of, router_id_of, asn_of = build_device_tables(set(nodes) | set(adjacency))
+    pending = []
     
     for device_name, device_obj in devices.items():
         try:
             device_data = nodes.get(device_name, {})
-            role = determine_device_role(device_name)
+            role = role_of[device_name]
             
             # Only generate config for network devices (cEOS)
             if device_data.get('kind') != 'ceos':
@@ -620,23 +910,27 @@ def generate_and_apply_config_contexts(nb, clab_data, devices):
             
             if role == 'spine':
                 config_context = generate_spine_config_context(
-                    device_name, device_data, clab_data, devices
+                    device_name, device_data, adjacency, devices,
+                    role_of, router_id_of, asn_of
                 )
             elif role == 'leaf':
                 config_context = generate_leaf_config_context(
-                    device_name, device_data, clab_data, devices
+                    device_name, device_data, adjacency, devices,
+                    role_of, router_id_of, asn_of
                 )
             else:
                 logger.warning(f"Unknown role '{role}' for device {device_name}, skipping config context")
                 continue
             
             if config_context:
-                apply_config_context(nb, device_obj, config_context, device_name)
+                pending.append((device_obj, config_context, device_name))
                 
         except Exception as e:
             logger.error(f"Error generating config context for {device_name}: {e}")
             continue
     
+    apply_config_contexts(nb, pending)
+    
     logger.info("Config context generation complete")
 
 def main():
@@ -690,9 +984,8 @@ Examples:
         try:
             nb = pynetbox.api(NETBOX_URL, token=NETBOX_APITOKEN)
             
-            # Disable SSL verification if requested
-            if args.no_ssl_verify:
-                nb.http_session.verify = False
+            # Share one keep-alive session across all API calls (SSL verification disabled if requested)
+            nb.http_session = create_http_session(verify_ssl=not args.no_ssl_verify)
             
             # Test connection
             nb.dcim.sites.count()
@@ -701,22 +994,25 @@ Examples:
             logger.error(f"Failed to connect to NetBox: {e}")
             sys.exit(1)
         
+        # Load existing objects once so lookups below don't hit the API per item
+        cache = prefetch_netbox_objects(nb)
+        
         # Create site from clab name
         clab_name = clab_data.get('name', 'containerlab')
-        site = get_or_create_site(nb, clab_name)
+        site = get_or_create_site(nb, clab_name, cache['sites'])
         logger.info(f"Using site: {site.name}")
         
         # Create devices
         logger.info("=" * 50)
         logger.info("Creating devices...")
         logger.info("=" * 50)
-        devices = create_devices(nb, clab_data, site.id)
+        devices = create_devices(nb, clab_data, site.id, cache)
         
         # Create interfaces and links
         logger.info("=" * 50)
         logger.info("Creating interfaces and links...")
         logger.info("=" * 50)
-        create_interfaces_and_links(nb, clab_data, devices)
+        create_interfaces_and_links(nb, clab_data, devices, cache['interfaces'])
         
         # Generate and apply config contexts
         if not args.skip_config_context: